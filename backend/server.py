@@ -1,18 +1,32 @@
-from fastapi import FastAPI, APIRouter, Depends, HTTPException
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from fastapi.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
-from pydantic import BaseModel, EmailStr
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from pydantic import BaseModel, ConfigDict, EmailStr, TypeAdapter
 from typing import List, Optional
-from passlib.context import CryptContext
+import bcrypt
 from datetime import datetime, timezone, timedelta
 from enum import Enum
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from bson import ObjectId
-import jwt
+from bson.codec_options import CodecOptions
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import TTLCache
+from jose import jwt, ExpiredSignatureError, JWTError
+import asyncio
+import functools
+import hashlib
+import json
 import logging
+import orjson
+import re
 import os
+import redis.asyncio as aioredis
+import time
 
 logging.basicConfig(
     level=logging.INFO,
@@ -26,21 +40,88 @@ JWT_SECRET = os.getenv("JWT_SECRET_KEY")
 JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 JWT_EXPIRATION = int(os.getenv("JWT_EXPIRATION_MINUTES", 60))
 DB_NAME = "Assignment"
+MONGO_MAX_POOL = int(os.getenv("MONGO_MAX_POOL", 50))
+MONGO_MIN_POOL = int(os.getenv("MONGO_MIN_POOL", 5))
+MONGO_MAX_CONNECTING = int(os.getenv("MONGO_MAX_CONNECTING", 4))
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "http://localhost:3000,http://127.0.0.1:3000").split(",") if o.strip() and o.strip() != "*"] or ["http://localhost:3000", "http://127.0.0.1:3000"]
+REDIS_URL = os.getenv("REDIS_URL")
+AUTH_CACHE_TTL = int(os.getenv("AUTH_CACHE_TTL_SECONDS", 300))
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
+def _is_bcrypt_hash(password: str) -> bool:
+    return isinstance(password, str) and password.startswith("$2")
+
+async def migrate_admins(db):
+    async for admin in db.admins.find():
+        admin.setdefault("role", "admin")
+        if not _is_bcrypt_hash(admin["password"]):
+            admin["password"] = await asyncio.to_thread(hash_password, admin["password"])
+        try:
+            await db.users.insert_one(admin)
+        except DuplicateKeyError:
+            logger.warning(f"Admin {admin['email']} already exists in users, skipping")
+            continue
+        await db.admins.delete_one({"_id": admin["_id"]})
+        logger.info(f"Migrated admin {admin['email']} into users collection")
+
+    async for admin in db.users.find({"role": "admin"}, {"password": 1, "email": 1}):
+        if not _is_bcrypt_hash(admin["password"]):
+            hashed = await asyncio.to_thread(hash_password, admin["password"])
+            await db.users.update_one({"_id": admin["_id"]}, {"$set": {"password": hashed}})
+            logger.info(f"Hashed legacy plaintext password for admin {admin['email']}")
+
+async def migrate_user_id_strings(db):
+    try:
+        for collection in (db.tasks, db.notes):
+            async for doc in collection.find({"user_id": {"$type": "string"}}, {"user_id": 1}):
+                if ObjectId.is_valid(doc["user_id"]):
+                    await collection.update_one(
+                        {"_id": doc["_id"]},
+                        {"$set": {"user_id": ObjectId(doc["user_id"])}}
+                    )
+    except Exception as e:
+        logger.error(f"user_id migration failed: {str(e)}")
+
+async def warm_database(db):
+    await db.users.create_index("email", unique=True)
+    await migrate_admins(db)
+    await migrate_user_id_strings(db)
+    await asyncio.gather(
+        db.tasks.create_index([("user_id", 1), ("_id", 1)]),
+        db.tasks.create_index([("user_id", 1), ("updated_at", -1)]),
+        db.notes.create_index([("user_id", 1), ("updated_at", -1)]),
+        db.command("ping")
+    )
+    logger.info("Indexes ensured and connection pool warmed")
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    client = AsyncIOMotorClient(MONGO_URL)
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=min(32, 4 * (os.cpu_count() or 1)))
+    )
+    client = AsyncIOMotorClient(
+        MONGO_URL,
+        maxPoolSize=MONGO_MAX_POOL,
+        minPoolSize=MONGO_MIN_POOL,
+        maxConnecting=MONGO_MAX_CONNECTING,
+        maxIdleTimeMS=60000,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=10000
+    )
     app.mongodb_client = client
-    app.db = client[DB_NAME]
+    app.db = client.get_database(DB_NAME, codec_options=CodecOptions(tz_aware=True, tzinfo=timezone.utc))
+    app.redis = aioredis.from_url(REDIS_URL, decode_responses=True) if REDIS_URL else None
+    await warm_database(app.db)
     logger.info("Database connection established")
     yield
+    if app.redis:
+        await app.redis.aclose()
     client.close()
     logger.info("Database connection closed")
 
-app = FastAPI(title="Assignment API", lifespan=lifespan)
+app = FastAPI(title="Assignment API", lifespan=lifespan, default_response_class=ORJSONResponse)
 api_router = APIRouter(prefix="/api/v1")
 
 class UserRole(str, Enum):
@@ -61,6 +142,8 @@ class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
 
 class UserResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     email: str
     name: str
@@ -95,6 +178,8 @@ class TaskUpdate(BaseModel):
     priority: Optional[TaskPriority] = None
 
 class TaskResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     description: str
@@ -115,6 +200,8 @@ class NoteUpdate(BaseModel):
     tags: Optional[List[str]] = None
 
 class NoteResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: str
     title: str
     content: str
@@ -123,85 +210,148 @@ class NoteResponse(BaseModel):
     created_at: str
     updated_at: str
 
+USER_LIST_ADAPTER = TypeAdapter(List[UserResponse])
+TASK_LIST_ADAPTER = TypeAdapter(List[TaskResponse])
+NOTE_LIST_ADAPTER = TypeAdapter(List[NoteResponse])
+
+USER_FIELDS = {"email": 1, "name": 1, "role": 1, "created_at": 1}
+TASK_FIELDS = {"title": 1, "description": 1, "status": 1, "priority": 1, "user_id": 1, "created_at": 1, "updated_at": 1}
+NOTE_FIELDS = {"title": 1, "content": 1, "tags": 1, "user_id": 1, "created_at": 1, "updated_at": 1}
+
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(BCRYPT_ROUNDS)).decode("utf-8")
 
 def verify_password(plain: str, hashed: str) -> bool:
-    return pwd_context.verify(plain, hashed)
+    try:
+        return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
+    except ValueError:
+        return False
+
+@functools.lru_cache(maxsize=1024)
+def _sign(email: str, role: str, user_id: str, exp_minute: int) -> str:
+    claims = {"email": email, "role": role, "user_id": user_id, "exp": exp_minute * 60}
+    return jwt.encode(claims, JWT_SECRET, algorithm=JWT_ALGORITHM)
 
 def create_access_token(data: dict) -> str:
-    to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=JWT_EXPIRATION)
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, JWT_SECRET, algorithm=JWT_ALGORITHM)
+    return _sign(data["email"], data["role"], data.get("user_id", ""), int(expire.timestamp() // 60))
 
 def decode_token(token: str) -> dict:
     try:
         return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-    except jwt.ExpiredSignatureError:
+    except ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
-    except jwt.InvalidTokenError:
+    except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+async def _auth_cache_get(key: str) -> Optional[dict]:
+    if not app.redis:
+        return None
+    try:
+        cached = await app.redis.get(key)
+        return json.loads(cached) if cached else None
+    except Exception as e:
+        logger.warning(f"Auth cache read failed: {str(e)}")
+        return None
+
+async def _auth_cache_set(key: str, value: dict):
+    if not app.redis:
+        return
+    try:
+        await app.redis.setex(key, AUTH_CACHE_TTL, json.dumps(value))
+    except Exception as e:
+        logger.warning(f"Auth cache write failed: {str(e)}")
+
+async def invalidate_auth_cache(role: str, email: str):
+    if not app.redis:
+        return
+    try:
+        await app.redis.delete(f"auth:{role}:{email}")
+    except Exception as e:
+        logger.warning(f"Auth cache invalidation failed: {str(e)}")
+
+_jwt_cache = TTLCache(maxsize=10000, ttl=30)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    token = credentials.credentials
+    token_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    entry = _jwt_cache.get(token_key)
+    if entry and entry[1] > time.time():
+        return entry[0]
+
     try:
-        token = credentials.credentials
         payload = decode_token(token)
         email = payload.get("email")
         role = payload.get("role")
-        
+
         if not email or not role:
             raise HTTPException(status_code=401, detail="Invalid token payload")
-            
-        db = app.db
-        collection = db.admins if role == "admin" else db.users
-        user = await collection.find_one({"email": email})
-        
+
+        user_id = payload.get("user_id")
+        if user_id:
+            current_user = {"email": email, "role": role, "user_id": user_id}
+            _jwt_cache[token_key] = (current_user, payload.get("exp", 0))
+            return current_user
+
+        cache_key = f"auth:{role}:{email}"
+        cached = await _auth_cache_get(cache_key)
+        if cached:
+            _jwt_cache[token_key] = (cached, payload.get("exp", 0))
+            return cached
+
+        user = await app.db.users.find_one({"email": email}, {"email": 1})
+
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
-            
-        return {
-            "email": user["email"], 
-            "role": role, 
+
+        current_user = {
+            "email": user["email"],
+            "role": role,
             "user_id": str(user["_id"])
         }
+        await _auth_cache_set(cache_key, current_user)
+        _jwt_cache[token_key] = (current_user, payload.get("exp", 0))
+        return current_user
     except Exception as e:
         logger.error(f"Error in get_current_user: {str(e)}")
         raise HTTPException(status_code=401, detail="Authentication failed")
 
+_OBJECT_ID_HEX = re.compile(r"^[0-9a-fA-F]{24}$").match
+
 def validate_object_id(id: str) -> ObjectId:
     if not id or id == "undefined":
         raise HTTPException(status_code=400, detail="Invalid ID provided")
-    
-    if not ObjectId.is_valid(id):
+
+    if not _OBJECT_ID_HEX(id):
         raise HTTPException(status_code=400, detail="Invalid ID format")
-    
+
     return ObjectId(id)
 
 @api_router.post("/auth/register", response_model=Token)
 async def register(user_data: UserCreate):
     logger.info(f"Registration attempt for email: {user_data.email}")
     
-    existing = await app.db.users.find_one({"email": user_data.email})
+    existing = await app.db.users.find_one({"email": user_data.email}, {"_id": 1})
     if existing:
         raise HTTPException(status_code=400, detail="Email already registered")
     
+    hashed = await asyncio.to_thread(hash_password, user_data.password)
     doc = {
         "email": user_data.email,
         "name": user_data.name,
-        "password": hash_password(user_data.password),
+        "password": hashed,
         "role": "user",
         "created_at": datetime.now(timezone.utc)
     }
     result = await app.db.users.insert_one(doc)
     doc["_id"] = result.inserted_id
-    token = create_access_token({"email": doc["email"], "role": "user"})
+    token = create_access_token({"email": doc["email"], "role": "user", "user_id": str(doc["_id"])})
     
     logger.info(f"User registered successfully: {user_data.email}")
     return Token(
         access_token=token,
         token_type="bearer",
-        user=UserResponse(
+        user=UserResponse.model_construct(
             id=str(doc["_id"]),
             email=doc["email"],
             name=doc["name"],
@@ -214,28 +364,23 @@ async def register(user_data: UserCreate):
 async def login(user_data: UserLogin):
     logger.info(f"Login attempt for email: {user_data.email}")
     
-    user = await app.db.users.find_one({"email": user_data.email}) or await app.db.admins.find_one({"email": user_data.email})
+    user = await app.db.users.find_one({"email": user_data.email}, {**USER_FIELDS, "password": 1})
     if not user:
         logger.warning(f"Login failed: User not found - {user_data.email}")
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    if user.get("role") == "admin":
-        if user_data.password != user["password"]:
-            logger.warning(f"Login failed: Invalid password for admin - {user_data.email}")
-            raise HTTPException(status_code=401, detail="Invalid credentials")
-    else:
-        if not verify_password(user_data.password, user["password"]):
-            logger.warning(f"Login failed: Invalid password for user - {user_data.email}")
-            raise HTTPException(status_code=401, detail="Invalid credentials")
+    if not await asyncio.to_thread(verify_password, user_data.password, user["password"]):
+        logger.warning(f"Login failed: Invalid password for user - {user_data.email}")
+        raise HTTPException(status_code=401, detail="Invalid credentials")
     
-    token = create_access_token({"email": user["email"], "role": user["role"]})
+    token = create_access_token({"email": user["email"], "role": user["role"], "user_id": str(user["_id"])})
     created_at = user["created_at"].isoformat() if isinstance(user["created_at"], datetime) else str(user["created_at"])
     
     logger.info(f"Login successful: {user_data.email}")
     return Token(
         access_token=token,
         token_type="bearer",
-        user=UserResponse(
+        user=UserResponse.model_construct(
             id=str(user["_id"]),
             email=user["email"],
             name=user["name"],
@@ -246,12 +391,11 @@ async def login(user_data: UserLogin):
 
 @api_router.get("/auth/me", response_model=UserResponse)
 async def get_current_user_profile(current_user=Depends(get_current_user)):
-    db = app.db.admins if current_user["role"] == "admin" else app.db.users
-    user = await db.find_one({"email": current_user["email"]})
+    user = await app.db.users.find_one({"email": current_user["email"]}, USER_FIELDS)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return UserResponse(
+    return UserResponse.model_construct(
         id=str(user["_id"]),
         email=user["email"],
         name=user["name"],
@@ -259,24 +403,33 @@ async def get_current_user_profile(current_user=Depends(get_current_user)):
         created_at=user["created_at"].isoformat() if isinstance(user["created_at"], datetime) else str(user["created_at"])
     )
 
-@api_router.get("/tasks", response_model=List[TaskResponse])
+@api_router.get("/tasks")
 async def get_tasks(current_user=Depends(get_current_user)):
-    tasks = await app.db.tasks.find({"user_id": current_user["user_id"]}).to_list(100)
-    for task in tasks:
-        task["id"] = str(task["_id"])
-        task["created_at"] = task["created_at"].isoformat() if isinstance(task["created_at"], datetime) else str(task["created_at"])
-        task["updated_at"] = task["updated_at"].isoformat() if isinstance(task["updated_at"], datetime) else str(task["updated_at"])
-    return tasks
+    tasks = [
+        TaskResponse.model_construct(
+            id=str(task["_id"]),
+            title=task["title"],
+            description=task["description"],
+            status=task["status"],
+            priority=task["priority"],
+            user_id=str(task["user_id"]),
+            created_at=task["created_at"].isoformat(),
+            updated_at=task["updated_at"].isoformat()
+        )
+        async for task in app.db.tasks.find({"user_id": ObjectId(current_user["user_id"])}, TASK_FIELDS).limit(100).batch_size(100)
+    ]
+    return Response(content=TASK_LIST_ADAPTER.dump_json(tasks), media_type="application/json")
 
 @api_router.get("/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(task_id: str, current_user=Depends(get_current_user)):
     obj_id = validate_object_id(task_id)
     
-    task = await app.db.tasks.find_one({"_id": obj_id, "user_id": current_user["user_id"]})
+    task = await app.db.tasks.find_one({"_id": obj_id, "user_id": ObjectId(current_user["user_id"])}, TASK_FIELDS)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     task["id"] = str(task["_id"])
+    task["user_id"] = str(task["user_id"])
     task["created_at"] = task["created_at"].isoformat() if isinstance(task["created_at"], datetime) else str(task["created_at"])
     task["updated_at"] = task["updated_at"].isoformat() if isinstance(task["updated_at"], datetime) else str(task["updated_at"])
     return task
@@ -284,66 +437,84 @@ async def get_task(task_id: str, current_user=Depends(get_current_user)):
 @api_router.post("/tasks", response_model=TaskResponse)
 async def create_task(task_data: TaskCreate, current_user=Depends(get_current_user)):
     doc = task_data.model_dump()
-    doc["user_id"] = current_user["user_id"]
-    doc["created_at"] = datetime.now(timezone.utc)
-    doc["updated_at"] = datetime.now(timezone.utc)
-    result = await app.db.tasks.insert_one(doc)
-    doc["id"] = str(result.inserted_id)
-    doc["created_at"] = doc["created_at"].isoformat()
-    doc["updated_at"] = doc["updated_at"].isoformat()
-    return doc
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    doc["user_id"] = ObjectId(current_user["user_id"])
+    doc["created_at"] = now
+    doc["updated_at"] = now
+    doc["_id"] = ObjectId()
+    insert = asyncio.create_task(app.db.tasks.insert_one(doc))
+    response = TaskResponse.model_construct(
+        id=str(doc["_id"]),
+        title=doc["title"],
+        description=doc["description"],
+        status=doc["status"],
+        priority=doc["priority"],
+        user_id=current_user["user_id"],
+        created_at=now_iso,
+        updated_at=now_iso
+    )
+    await insert
+    return response
 
 @api_router.put("/tasks/{task_id}", response_model=TaskResponse)
 async def update_task(task_id: str, task_data: TaskUpdate, current_user=Depends(get_current_user)):
     obj_id = validate_object_id(task_id)
-    
-    existing_task = await app.db.tasks.find_one({"_id": obj_id, "user_id": current_user["user_id"]})
-    if not existing_task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
+
     update_data = task_data.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now(timezone.utc)
-    
-    await app.db.tasks.update_one(
-        {"_id": obj_id},
-        {"$set": update_data}
+
+    updated_task = await app.db.tasks.find_one_and_update(
+        {"_id": obj_id, "user_id": ObjectId(current_user["user_id"])},
+        {"$set": update_data},
+        projection=TASK_FIELDS,
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_task = await app.db.tasks.find_one({"_id": obj_id})
+    if not updated_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
     updated_task["id"] = str(updated_task["_id"])
-    updated_task["created_at"] = updated_task["created_at"].isoformat() if isinstance(updated_task["created_at"], datetime) else str(updated_task["created_at"])
-    updated_task["updated_at"] = updated_task["updated_at"].isoformat() if isinstance(updated_task["updated_at"], datetime) else str(updated_task["updated_at"])
-    
+    updated_task["user_id"] = str(updated_task["user_id"])
+    updated_task["created_at"] = updated_task["created_at"].isoformat()
+    updated_task["updated_at"] = updated_task["updated_at"].isoformat()
     return updated_task
 
 @api_router.delete("/tasks/{task_id}")
 async def delete_task(task_id: str, current_user=Depends(get_current_user)):
     obj_id = validate_object_id(task_id)
     
-    result = await app.db.tasks.delete_one({"_id": obj_id, "user_id": current_user["user_id"]})
+    result = await app.db.tasks.delete_one({"_id": obj_id, "user_id": ObjectId(current_user["user_id"])})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Task not found")
     
     return {"message": "Task deleted successfully"}
 
-@api_router.get("/notes", response_model=List[NoteResponse])
+@api_router.get("/notes")
 async def get_notes(current_user=Depends(get_current_user)):
-    notes = await app.db.notes.find({"user_id": current_user["user_id"]}).to_list(100)
-    for note in notes:
-        note["id"] = str(note["_id"])
-        note["created_at"] = note["created_at"].isoformat() if isinstance(note["created_at"], datetime) else str(note["created_at"])
-        note["updated_at"] = note["updated_at"].isoformat() if isinstance(note["updated_at"], datetime) else str(note["updated_at"])
-    return notes
+    notes = [
+        NoteResponse.model_construct(
+            id=str(note["_id"]),
+            title=note["title"],
+            content=note["content"],
+            tags=note["tags"],
+            user_id=str(note["user_id"]),
+            created_at=note["created_at"].isoformat(),
+            updated_at=note["updated_at"].isoformat()
+        )
+        async for note in app.db.notes.find({"user_id": ObjectId(current_user["user_id"])}, NOTE_FIELDS).limit(100).batch_size(100)
+    ]
+    return Response(content=NOTE_LIST_ADAPTER.dump_json(notes), media_type="application/json")
 
 @api_router.get("/notes/{note_id}", response_model=NoteResponse)
 async def get_note(note_id: str, current_user=Depends(get_current_user)):
     obj_id = validate_object_id(note_id)
     
-    note = await app.db.notes.find_one({"_id": obj_id, "user_id": current_user["user_id"]})
+    note = await app.db.notes.find_one({"_id": obj_id, "user_id": ObjectId(current_user["user_id"])}, NOTE_FIELDS)
     if not note:
         raise HTTPException(status_code=404, detail="Note not found")
     
     note["id"] = str(note["_id"])
+    note["user_id"] = str(note["user_id"])
     note["created_at"] = note["created_at"].isoformat() if isinstance(note["created_at"], datetime) else str(note["created_at"])
     note["updated_at"] = note["updated_at"].isoformat() if isinstance(note["updated_at"], datetime) else str(note["updated_at"])
     return note
@@ -351,58 +522,73 @@ async def get_note(note_id: str, current_user=Depends(get_current_user)):
 @api_router.post("/notes", response_model=NoteResponse)
 async def create_note(note_data: NoteCreate, current_user=Depends(get_current_user)):
     doc = note_data.model_dump()
-    doc["user_id"] = current_user["user_id"]
-    doc["created_at"] = datetime.now(timezone.utc)
-    doc["updated_at"] = datetime.now(timezone.utc)
-    result = await app.db.notes.insert_one(doc)
-    doc["id"] = str(result.inserted_id)
-    doc["created_at"] = doc["created_at"].isoformat()
-    doc["updated_at"] = doc["updated_at"].isoformat()
-    return doc
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    doc["user_id"] = ObjectId(current_user["user_id"])
+    doc["created_at"] = now
+    doc["updated_at"] = now
+    doc["_id"] = ObjectId()
+    insert = asyncio.create_task(app.db.notes.insert_one(doc))
+    response = NoteResponse.model_construct(
+        id=str(doc["_id"]),
+        title=doc["title"],
+        content=doc["content"],
+        tags=doc["tags"],
+        user_id=current_user["user_id"],
+        created_at=now_iso,
+        updated_at=now_iso
+    )
+    await insert
+    return response
 
 @api_router.put("/notes/{note_id}", response_model=NoteResponse)
 async def update_note(note_id: str, note_data: NoteUpdate, current_user=Depends(get_current_user)):
     obj_id = validate_object_id(note_id)
-    
-    existing_note = await app.db.notes.find_one({"_id": obj_id, "user_id": current_user["user_id"]})
-    if not existing_note:
-        raise HTTPException(status_code=404, detail="Note not found")
-    
+
     update_data = note_data.model_dump(exclude_unset=True)
     update_data["updated_at"] = datetime.now(timezone.utc)
-    
-    await app.db.notes.update_one(
-        {"_id": obj_id},
-        {"$set": update_data}
+
+    updated_note = await app.db.notes.find_one_and_update(
+        {"_id": obj_id, "user_id": ObjectId(current_user["user_id"])},
+        {"$set": update_data},
+        projection=NOTE_FIELDS,
+        return_document=ReturnDocument.AFTER
     )
-    
-    updated_note = await app.db.notes.find_one({"_id": obj_id})
+    if not updated_note:
+        raise HTTPException(status_code=404, detail="Note not found")
+
     updated_note["id"] = str(updated_note["_id"])
-    updated_note["created_at"] = updated_note["created_at"].isoformat() if isinstance(updated_note["created_at"], datetime) else str(updated_note["created_at"])
-    updated_note["updated_at"] = updated_note["updated_at"].isoformat() if isinstance(updated_note["updated_at"], datetime) else str(updated_note["updated_at"])
-    
+    updated_note["user_id"] = str(updated_note["user_id"])
+    updated_note["created_at"] = updated_note["created_at"].isoformat()
+    updated_note["updated_at"] = updated_note["updated_at"].isoformat()
     return updated_note
 
 @api_router.delete("/notes/{note_id}")
 async def delete_note(note_id: str, current_user=Depends(get_current_user)):
     obj_id = validate_object_id(note_id)
     
-    result = await app.db.notes.delete_one({"_id": obj_id, "user_id": current_user["user_id"]})
+    result = await app.db.notes.delete_one({"_id": obj_id, "user_id": ObjectId(current_user["user_id"])})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Note not found")
     
     return {"message": "Note deleted successfully"}
 
-@api_router.get("/users", response_model=List[UserResponse])
+@api_router.get("/users")
 async def get_users(current_user=Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    users = await app.db.users.find().to_list(100)
-    for user in users:
-        user["id"] = str(user["_id"])
-        user["created_at"] = user["created_at"].isoformat() if isinstance(user["created_at"], datetime) else str(user["created_at"])
-    return users
+    users = [
+        UserResponse.model_construct(
+            id=str(user["_id"]),
+            email=user["email"],
+            name=user["name"],
+            role=user["role"],
+            created_at=user["created_at"].isoformat()
+        )
+        async for user in app.db.users.find({"role": "user"}, USER_FIELDS).limit(100).batch_size(50)
+    ]
+    return Response(content=USER_LIST_ADAPTER.dump_json(users), media_type="application/json")
 
 @api_router.delete("/users/{user_id}")
 async def delete_user(user_id: str, current_user=Depends(get_current_user)):
@@ -414,24 +600,28 @@ async def delete_user(user_id: str, current_user=Depends(get_current_user)):
     if current_user["user_id"] == user_id:
         raise HTTPException(status_code=400, detail="Cannot delete your own account")
     
-    result = await app.db.users.delete_one({"_id": obj_id})
-    if result.deleted_count == 0:
+    target = await app.db.users.find_one({"_id": obj_id, "role": "user"}, {"email": 1})
+    if not target:
         raise HTTPException(status_code=404, detail="User not found")
-    
-    await app.db.tasks.delete_many({"user_id": user_id})
-    await app.db.notes.delete_many({"user_id": user_id})
+
+    await app.db.users.delete_one({"_id": obj_id})
+    await invalidate_auth_cache("user", target["email"])
+
+    await asyncio.gather(
+        app.db.tasks.delete_many({"user_id": obj_id}),
+        app.db.notes.delete_many({"user_id": obj_id})
+    )
     
     logger.info(f"User {user_id} deleted by admin {current_user['email']}")
     return {"message": "User deleted successfully"}
 
 @api_router.get("/profile", response_model=UserResponse)
 async def get_profile(current_user=Depends(get_current_user)):
-    db = app.db.admins if current_user["role"] == "admin" else app.db.users
-    user = await db.find_one({"email": current_user["email"]})
+    user = await app.db.users.find_one({"email": current_user["email"]}, USER_FIELDS)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return UserResponse(
+    return UserResponse.model_construct(
         id=str(user["_id"]),
         email=user["email"],
         name=user["name"],
@@ -441,10 +631,10 @@ async def get_profile(current_user=Depends(get_current_user)):
 
 @api_router.put("/profile", response_model=UserResponse)
 async def update_profile(user_data: UserUpdate, current_user=Depends(get_current_user)):
-    db = app.db.admins if current_user["role"] == "admin" else app.db.users
-    
+    db = app.db.users
+
     if user_data.email and user_data.email != current_user["email"]:
-        existing_user = await db.find_one({"email": user_data.email})
+        existing_user = await db.find_one({"email": user_data.email}, {"_id": 1})
         if existing_user:
             raise HTTPException(status_code=400, detail="Email already registered")
     
@@ -455,12 +645,13 @@ async def update_profile(user_data: UserUpdate, current_user=Depends(get_current
         {"$set": update_data}
     )
     
-    updated_user = await db.find_one({"email": user_data.email or current_user["email"]})
-    
+    updated_user = await db.find_one({"email": user_data.email or current_user["email"]}, USER_FIELDS)
+    await invalidate_auth_cache(current_user["role"], current_user["email"])
+
     if user_data.email and user_data.email != current_user["email"]:
         logger.info(f"User {current_user['email']} updated email to {user_data.email}")
     
-    return UserResponse(
+    return UserResponse.model_construct(
         id=str(updated_user["_id"]),
         email=updated_user["email"],
         name=updated_user["name"],
@@ -470,52 +661,54 @@ async def update_profile(user_data: UserUpdate, current_user=Depends(get_current
 
 @api_router.put("/profile/password")
 async def change_password(old_password: str, new_password: str, current_user=Depends(get_current_user)):
-    if current_user["role"] == "admin":
-        admin = await app.db.admins.find_one({"email": current_user["email"]})
-        if not admin or admin["password"] != old_password:
-            raise HTTPException(status_code=400, detail="Current password is incorrect")
-        
-        await app.db.admins.update_one(
-            {"email": current_user["email"]},
-            {"$set": {"password": new_password}}
-        )
-    else:
-        user = await app.db.users.find_one({"email": current_user["email"]})
-        if not user or not verify_password(old_password, user["password"]):
-            raise HTTPException(status_code=400, detail="Current password is incorrect")
-        
-        await app.db.users.update_one(
-            {"email": current_user["email"]},
-            {"$set": {"password": hash_password(new_password)}}
-        )
+    user = await app.db.users.find_one({"email": current_user["email"]}, {"password": 1})
+    if not user or not await asyncio.to_thread(verify_password, old_password, user["password"]):
+        raise HTTPException(status_code=400, detail="Current password is incorrect")
+
+    new_hash = await asyncio.to_thread(hash_password, new_password)
+    await app.db.users.update_one(
+        {"email": current_user["email"]},
+        {"$set": {"password": new_hash}}
+    )
     
+    await invalidate_auth_cache(current_user["role"], current_user["email"])
     logger.info(f"Password changed for user: {current_user['email']}")
     return {"message": "Password updated successfully"}
 
-@app.get("/")
+ROOT_BYTES = orjson.dumps({
+    "message": "🚀 FastAPI Assignment API is running",
+    "endpoints": [
+        "/api/v1/auth/register",
+        "/api/v1/auth/login",
+        "/api/v1/auth/me",
+        "/api/v1/tasks",
+        "/api/v1/notes",
+        "/api/v1/users",
+        "/api/v1/profile"
+    ]
+})
+
+@app.get("/", include_in_schema=False)
 async def root():
-    return {
-        "message": "🚀 FastAPI Assignment API is running", 
-        "endpoints": [
-            "/api/v1/auth/register", 
-            "/api/v1/auth/login", 
-            "/api/v1/auth/me",
-            "/api/v1/tasks", 
-            "/api/v1/notes", 
-            "/api/v1/users", 
-            "/api/v1/profile"
-        ]
-    }
+    return Response(content=ROOT_BYTES, media_type="application/json")
 
 app.include_router(api_router)
 app.add_middleware(
-    CORSMiddleware, 
-    allow_origins=["*", "http://localhost:3000", "http://127.0.0.1:3000"], 
-    allow_credentials=True, 
-    allow_methods=["*"], 
+    CORSMiddleware,
+    allow_origins=CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
     allow_headers=["*"]
 )
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("server:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    uvicorn.run(
+        "server:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=int(os.getenv("UVICORN_WORKERS", os.cpu_count() or 1)),
+        loop="uvloop",
+        http="httptools",
+        reload=False
+    )
\ No newline at end of file